@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Super_RAG V1 - adk-agent load benchmark.
+
+Sends concurrent requests to a running adk-agent and reports throughput,
+latency, payload size and server-side serialization time. Uses only the
+standard library so it can run from any machine.
+
+Compare per-container throughput across worker counts by starting the agent
+with different WORKERS values and running the same benchmark against each:
+
+    for w in 1 2 4; do
+        WORKERS=$w python services/adk-agent/main.py &
+        sleep 10
+        python scripts/benchmark_agent.py --url http://localhost:8080 --label "workers=$w"
+        kill %1; wait
+    done
+
+Compare response shaping options against the same agent:
+
+    python scripts/benchmark_agent.py --label full
+    python scripts/benchmark_agent.py --context-mode ids --gzip --label compact
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+SERVER_TIMING_PATTERN = re.compile(r"serialize;dur=([0-9.]+)")
+
+DEFAULT_QUERIES = [
+    "What are the key points in the contract?",
+    "How do I configure the deployment?",
+    "Summarize the onboarding guide.",
+    "What are the liability clauses?",
+]
+
+
+def send_request(
+    url: str, path: str, payload: Optional[dict], token: Optional[str], gzip: bool
+) -> Tuple[float, int, Optional[float], bool]:
+    """
+    Send a single request to the agent.
+
+    Returns:
+        Tuple of (latency in seconds, response bytes on the wire, server
+        serialization time in ms if reported, success flag)
+    """
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(f"{url.rstrip('/')}{path}", data=data)
+    if data is not None:
+        request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    if gzip:
+        request.add_header("Accept-Encoding", "gzip")
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            body = response.read()
+            match = SERVER_TIMING_PATTERN.search(response.headers.get("Server-Timing", ""))
+            serialize_ms = float(match.group(1)) if match else None
+            return time.perf_counter() - start, len(body), serialize_ms, True
+    except Exception:
+        return time.perf_counter() - start, 0, None, False
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of a list of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the adk-agent service")
+    parser.add_argument("--url", default="http://localhost:8080", help="Agent base URL")
+    parser.add_argument("--path", default="/query", help="Endpoint to benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated services")
+    parser.add_argument("--label", default="", help="Label printed with the results")
+    parser.add_argument(
+        "--context-mode",
+        choices=["full", "snippet", "ids", "none"],
+        default="full",
+        help="Context detail requested from /query",
+    )
+    parser.add_argument("--fields", nargs="*", default=None, help="Response fields to request")
+    parser.add_argument("--gzip", action="store_true", help="Request gzip-compressed responses")
+    args = parser.parse_args()
+
+    def run(i: int) -> Tuple[float, int, Optional[float], bool]:
+        payload = None
+        if args.path == "/query":
+            payload = {
+                "query": DEFAULT_QUERIES[i % len(DEFAULT_QUERIES)],
+                "context_mode": args.context_mode,
+            }
+            if args.fields:
+                payload["fields"] = args.fields
+        return send_request(args.url, args.path, payload, args.token, args.gzip)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [r[0] for r in results if r[3]]
+    sizes = [r[1] for r in results if r[3]]
+    serialize_times = [r[2] for r in results if r[3] and r[2] is not None]
+    errors = sum(1 for r in results if not r[3])
+
+    print(f"== {args.label or args.url}{args.path}")
+    print(f"requests:    {args.requests} ({errors} errors), concurrency {args.concurrency}")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(
+            f"latency:     p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+            f"p95 {percentile(latencies, 95) * 1000:.1f} ms, "
+            f"p99 {percentile(latencies, 99) * 1000:.1f} ms"
+        )
+        print(f"payload:     {statistics.mean(sizes):.0f} bytes/response")
+    if serialize_times:
+        print(f"serialize:   {statistics.mean(serialize_times):.3f} ms/response (server)")
+
+
+if __name__ == "__main__":
+    main()
@@ -46,6 +46,8 @@ APIS=(
     "iam.googleapis.com"
     "artifactregistry.googleapis.com"
     "compute.googleapis.com"
+    "logging.googleapis.com"
+    "monitoring.googleapis.com"
 )
 
 for api in "${APIS[@]}"; do
@@ -6,6 +6,7 @@ import vertexai
 from vertexai.generative_models import GenerativeModel, GenerationConfig
 from config import settings
 from rag_retriever import RAGRetriever
+from query_embedder import LazyQueryEmbedding, create_query_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,8 @@ class ADKAgent:
         vertexai.init(project=settings.gcp_project_id, location=settings.gcp_region)
 
         self.model = GenerativeModel(settings.gemini_model)
-        self.retriever = RAGRetriever()
+        self.embedding_service = create_query_embedding_service()
+        self.retriever = RAGRetriever(embedding_service=self.embedding_service)
 
         self.generation_config = GenerationConfig(
             temperature=0.2,  # Lower temperature for more factual responses
@@ -49,10 +51,19 @@ class ADKAgent:
         try:
             logger.info(f"Processing query: '{query}'")
 
-            # Step 1: Retrieve relevant contexts from RAG
+            # Step 1: Prepare a lazy query embedding, computed at most once and
+            # only if a downstream stage needs it
+            query_embedding = (
+                LazyQueryEmbedding(self.embedding_service, query)
+                if self.embedding_service is not None
+                else None
+            )
+
+            # Step 2: Retrieve relevant contexts from RAG
             contexts = await self.retriever.retrieve_contexts(
                 query=query,
                 corpus_filter=corpus_filter,
+                query_embedding=query_embedding,
             )
 
             if not contexts:
@@ -63,13 +74,13 @@ class ADKAgent:
                     "model": settings.gemini_model,
                 }
 
-            # Step 2: Format contexts for the prompt
+            # Step 3: Format contexts for the prompt
             formatted_contexts = self.retriever.format_contexts_for_prompt(contexts)
 
-            # Step 3: Construct the prompt with grounded context
+            # Step 4: Construct the prompt with grounded context
             prompt = self._construct_prompt(query, formatted_contexts, include_citations)
 
-            # Step 4: Generate response with Gemini
+            # Step 5: Generate response with Gemini
             logger.info("Generating response with Gemini")
             response = self.model.generate_content(
                 prompt,
@@ -1,9 +1,32 @@
 """Configuration management for adk-agent service."""
 
+import math
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 
 
+def parse_workers(value: str) -> int:
+    """
+    Parse a worker count, accepting Cloud Run CPU notation.
+
+    Args:
+        value: Integer count, fractional CPUs (e.g. "0.5") or millicores
+            (e.g. "1000m"); "0" means one worker per available CPU
+
+    Returns:
+        Worker count (0 for automatic)
+    """
+    value = value.strip()
+    if value.endswith("m"):
+        cpus = float(value[:-1]) / 1000
+    else:
+        cpus = float(value)
+    if cpus <= 0:
+        return 0
+    return max(1, math.ceil(cpus))
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -16,6 +39,10 @@ class Settings(BaseSettings):
     technical_corpus_name: str = os.getenv("TECHNICAL_CORPUS_NAME", "")
     training_corpus_name: str = os.getenv("TRAINING_CORPUS_NAME", "")
 
+    # Corpus Registry (inline JSON takes precedence over the file path)
+    corpus_registry: str = os.getenv("CORPUS_REGISTRY", "")
+    corpus_registry_path: str = os.getenv("CORPUS_REGISTRY_PATH", "")
+
     # AI Model Configuration
     gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
 
@@ -23,9 +50,40 @@ class Settings(BaseSettings):
     top_k_chunks: int = int(os.getenv("TOP_K_CHUNKS", "5"))
     similarity_threshold: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.5"))
 
+    # Corpus Routing Configuration
+    corpus_routing_enabled: bool = os.getenv("CORPUS_ROUTING_ENABLED", "true").lower() == "true"
+    max_routed_corpora: int = int(os.getenv("MAX_ROUTED_CORPORA", "3"))
+    routing_min_similarity: float = float(os.getenv("ROUTING_MIN_SIMILARITY", "0.3"))
+
+    # Query Embedding Configuration
+    query_embedding_enabled: bool = os.getenv("QUERY_EMBEDDING_ENABLED", "true").lower() == "true"
+    embedding_provider: str = os.getenv("EMBEDDING_PROVIDER", "vertex")  # vertex or local
+    embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-004")
+    # Vector length of embedding_model, used to size the shared cache
+    embedding_dimensions: int = int(os.getenv("EMBEDDING_DIMENSIONS", "768"))
+    # sentence-transformers model used when embedding_provider is "local"
+    local_embedding_model: str = os.getenv(
+        "LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2"
+    )
+    embedding_batch_window_ms: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+    embedding_max_batch_size: int = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))
+    # Shared by all workers in a container; each 768-dim entry takes about 3 KB
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+    # Directory for the embedding cache and centroid files shared between workers
+    shared_state_dir: str = os.getenv(
+        "SHARED_STATE_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    )
+
+    # Response Configuration
+    snippet_chars: int = int(os.getenv("SNIPPET_CHARS", "200"))
+    gzip_minimum_size: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+
     # Server Configuration
     port: int = int(os.getenv("PORT", "8080"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    workers: int = parse_workers(os.getenv("WORKERS", "1"))  # 0 = one worker per available CPU
+    # Keep below Cloud Run's 10s gap between SIGTERM and SIGKILL
+    graceful_shutdown_timeout: int = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "8"))
 
     class Config:
         """Pydantic configuration."""
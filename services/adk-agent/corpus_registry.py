@@ -0,0 +1,122 @@
+"""Corpus registry loading for the adk-agent service."""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, List
+from pydantic import TypeAdapter, ValidationError
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorpusEntry:
+    """A single corpus the agent can search."""
+
+    name: str
+    corpus_name: str
+    description: str = ""
+    keywords: List[str] = field(default_factory=list)
+    # Searched when a query matches no corpus
+    default: bool = False
+
+
+_ENTRY_ADAPTER = TypeAdapter(CorpusEntry)
+
+
+def _default_registry() -> List[CorpusEntry]:
+    """Build the legacy three-corpus registry from individual settings."""
+    return [
+        CorpusEntry(
+            name="legal",
+            corpus_name=settings.legal_corpus_name,
+            description="Legal documents corpus",
+            default=True,
+        ),
+        CorpusEntry(
+            name="technical",
+            corpus_name=settings.technical_corpus_name,
+            description="Technical documents corpus",
+            default=True,
+        ),
+        CorpusEntry(
+            name="training",
+            corpus_name=settings.training_corpus_name,
+            description="Training documents corpus",
+            default=True,
+        ),
+    ]
+
+
+def _registry_items(raw: Any, source: str) -> List[Any]:
+    """Return the raw entries of a parsed registry, checking its top-level shape."""
+    if not isinstance(raw, dict) or not isinstance(raw.get("corpora", []), list):
+        raise ValueError(f'Corpus registry in {source} must be an object with a "corpora" list')
+    return raw.get("corpora", [])
+
+
+def _validate_entry(index: int, item: Any, source: str) -> CorpusEntry:
+    """
+    Validate one raw registry entry.
+
+    Keys used only by the other service are ignored, so both services can
+    read the same registry file.
+
+    Raises:
+        ValueError: Naming the entry and the fields that failed validation
+    """
+    try:
+        return _ENTRY_ADAPTER.validate_python(item)
+    except ValidationError as e:
+        name = item.get("name") if isinstance(item, dict) else None
+        label = f"#{index}" + (f" ({name!r})" if name else "")
+        raise ValueError(f"Invalid corpus registry entry {label} in {source}: {e}") from e
+
+
+def load_corpus_registry() -> List[CorpusEntry]:
+    """
+    Load the corpus registry.
+
+    The registry is read from the inline ``CORPUS_REGISTRY`` JSON setting if
+    present, otherwise from the file at ``CORPUS_REGISTRY_PATH``. When neither
+    is configured, the legacy legal/technical/training corpora are used.
+
+    Expected format:
+    {
+        "corpora": [
+            {
+                "name": "legal",
+                "corpus_name": "projects/.../ragCorpora/...",
+                "description": "...",
+                "keywords": ["contract", "liability", ...],
+                "default": true,
+                ...
+            }
+        ]
+    }
+
+    Returns:
+        List of registered corpora
+
+    Raises:
+        ValueError: If the registry or one of its entries is malformed
+    """
+    if settings.corpus_registry:
+        raw = json.loads(settings.corpus_registry)
+        source = "CORPUS_REGISTRY"
+    elif settings.corpus_registry_path:
+        with open(settings.corpus_registry_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        source = settings.corpus_registry_path
+    else:
+        logger.info("No corpus registry configured, using default corpora")
+        return _default_registry()
+
+    entries = [
+        _validate_entry(index, item, source)
+        for index, item in enumerate(_registry_items(raw, source))
+    ]
+
+    logger.info(f"Loaded {len(entries)} corpora from {source}")
+    return entries
@@ -0,0 +1,190 @@
+"""Query-time corpus selection so each query only searches relevant corpora."""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from config import settings
+from corpus_registry import CorpusEntry
+from query_embedder import LazyQueryEmbedding, QueryEmbeddingService
+from shared_state import fingerprint, load_or_build_array, shared_path
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase a string and split it into word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _unit(vectors: Sequence) -> np.ndarray:
+    """Scale vectors (or matrix rows) to unit length so dot products are cosine similarities."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class CorpusRouter:
+    """
+    Classifier that picks the corpora a query should search.
+
+    Queries are first matched against corpus keywords. When no keyword
+    matches and a query embedding is available, corpora are ranked by
+    similarity to embedding centroids built from their descriptions and
+    keywords.
+    """
+
+    def __init__(self, entries: List[CorpusEntry]):
+        """
+        Build the keyword index for the registered corpora.
+
+        Args:
+            entries: Registered corpora
+        """
+        self.entries = [entry for entry in entries if entry.corpus_name]
+        self.by_name: Dict[str, CorpusEntry] = {
+            entry.name: entry for entry in self.entries
+        }
+
+        # Inverted index: token -> {corpus_name: weight}. A token shared by
+        # many corpora says little about the query, so its weight is split.
+        postings: Dict[str, set] = defaultdict(set)
+        for entry in self.entries:
+            for keyword in [entry.name, *entry.keywords]:
+                for token in _tokenize(keyword):
+                    postings[token].add(entry.corpus_name)
+
+        self._index: Dict[str, Dict[str, float]] = {
+            token: {corpus: 1.0 / len(corpora) for corpus in corpora}
+            for token, corpora in postings.items()
+        }
+
+        # One unit-length centroid row per name in _centroid_names, set once
+        # build_centroids() succeeds
+        self._centroid_names: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+
+        logger.info(
+            f"Initialized corpus router with {len(self.entries)} corpora "
+            f"and {len(self._index)} keywords"
+        )
+
+    @property
+    def corpus_names(self) -> List[str]:
+        """All routable corpus resource names."""
+        return [entry.corpus_name for entry in self.entries]
+
+    def fallback(self, max_corpora: int) -> List[str]:
+        """
+        Corpora to search when nothing matched the query.
+
+        Args:
+            max_corpora: Maximum corpora to return
+
+        Returns:
+            Corpora marked as default in the registry (or the first registered
+            corpora if none are), capped at max_corpora
+        """
+        defaults = [entry.corpus_name for entry in self.entries if entry.default]
+        return (defaults or self.corpus_names)[:max_corpora]
+
+    @property
+    def has_centroids(self) -> bool:
+        """Whether embedding centroids have been built."""
+        return self._centroids is not None
+
+    async def build_centroids(self, embedding_service: QueryEmbeddingService) -> None:
+        """
+        Embed each corpus's description and keywords and average them into a centroid.
+
+        The first worker in a container to get here computes the centroids
+        and saves them to the shared state directory; the others load them.
+
+        Args:
+            embedding_service: Service used to embed the corpus texts
+        """
+        texts: List[str] = []
+        owners: List[str] = []
+        for entry in self.entries:
+            entry_texts = [t for t in [entry.description, *entry.keywords] if t] or [entry.name]
+            texts.extend(entry_texts)
+            owners.extend([entry.corpus_name] * len(entry_texts))
+
+        names = list(dict.fromkeys(owners))
+        rows = {corpus: i for i, corpus in enumerate(names)}
+
+        async def build() -> np.ndarray:
+            vectors = np.asarray(await embedding_service.embed_uncached(texts), dtype=np.float32)
+            sums = np.zeros((len(names), vectors.shape[1]), dtype=np.float32)
+            np.add.at(sums, [rows[corpus] for corpus in owners], vectors)
+            return _unit(sums)
+
+        key = fingerprint(embedding_service.embedder.name, texts, owners)
+        centroids = await load_or_build_array(shared_path(f"centroids-{key}.npy"), build)
+
+        self._centroid_names = names
+        self._centroids = centroids
+        logger.info(f"Built embedding centroids for {len(names)} corpora")
+
+    def resolve(self, corpus_filter: List[str]) -> List[str]:
+        """
+        Resolve a client-supplied corpus filter to corpus resource names.
+
+        Args:
+            corpus_filter: Registry names (e.g., "legal") or full resource names
+
+        Returns:
+            List of corpus resource names
+        """
+        return [
+            self.by_name[name].corpus_name if name in self.by_name else name
+            for name in corpus_filter
+        ]
+
+    async def route(
+        self,
+        query: str,
+        max_corpora: Optional[int] = None,
+        query_embedding: Optional[LazyQueryEmbedding] = None,
+    ) -> List[str]:
+        """
+        Select the corpora most relevant to a query.
+
+        Args:
+            query: User query string
+            max_corpora: Maximum corpora to return (defaults to settings)
+            query_embedding: Lazy query embedding, only resolved when no
+                keyword matches and centroids are available
+
+        Returns:
+            Corpus resource names ordered by relevance, or the default
+            corpora if neither keywords nor centroids selected any
+        """
+        if max_corpora is None:
+            max_corpora = settings.max_routed_corpora
+
+        scores: Dict[str, float] = defaultdict(float)
+        for token in set(_tokenize(query)):
+            for corpus, weight in self._index.get(token, {}).items():
+                scores[corpus] += weight
+
+        vector = None
+        if not scores and query_embedding is not None and self._centroids is not None:
+            vector = await query_embedding.get()
+
+        if vector is not None:
+            # One matrix-vector product scores every corpus at once
+            similarities = self._centroids @ _unit(vector)
+            for i in np.flatnonzero(similarities >= settings.routing_min_similarity):
+                scores[self._centroid_names[i]] = float(similarities[i])
+
+        if not scores:
+            logger.info("No corpus matched query, searching default corpora")
+            return self.fallback(max_corpora)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:max_corpora]
+        logger.info(f"Routed query to {len(ranked)} of {len(self.entries)} corpora")
+        return ranked
@@ -1,11 +1,17 @@
 """ADK Agent Service - Handles user queries with RAG-grounded responses."""
 
 import logging
+import os
 import sys
-from typing import Optional, List
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Literal, Optional, List
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from gunicorn.app.base import BaseApplication
 from pydantic import BaseModel
+import orjson
 import uvicorn
 
 from config import settings
@@ -19,15 +25,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The agent is created per worker in the lifespan hook rather than at import
+# time, so the gunicorn arbiter does not build a copy of its own.
+agent: Optional[ADKAgent] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the agent when a worker starts serving and stop its background work on shutdown."""
+    global agent
+    agent = ADKAgent()
+    agent.retriever.start_background_tasks()
+    yield
+    await agent.retriever.stop_background_tasks()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="ADK Agent Service",
     description="RAG-powered question answering service using Vertex AI and Gemini",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Initialize the agent
-agent = ADKAgent()
+# Compress responses for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
 
 
 class QueryRequest(BaseModel):
@@ -36,18 +59,88 @@ class QueryRequest(BaseModel):
     query: str
     corpus_filter: Optional[List[str]] = None
     include_citations: bool = True
+    # full: complete chunks, snippet: truncated text, ids: metadata only, none: omitted
+    context_mode: Literal["full", "snippet", "ids", "none"] = "full"
+    # Top-level response fields to return (defaults to all)
+    fields: Optional[List[str]] = None
+
+
+class QueryContext(BaseModel):
+    """A retrieved context as returned by the query endpoint."""
+
+    id: str
+    rank: int
+    source: str
+    distance: Optional[float] = None
+    # Present when context_mode is "full"
+    text: Optional[str] = None
+    # Present when context_mode is "snippet"
+    snippet: Optional[str] = None
 
 
 class QueryResponse(BaseModel):
-    """Response model for query endpoint."""
+    """
+    Response model for query endpoint.
+
+    Every field is optional because the request's ``fields`` selector can
+    omit any of them. Only the fields listed there are returned.
+    """
 
-    response: str
-    contexts: List[dict]
-    model: str
-    num_contexts_used: int
+    response: Optional[str] = None
+    contexts: Optional[List[QueryContext]] = None
+    model: Optional[str] = None
+    num_contexts_used: Optional[int] = None
     error: Optional[str] = None
 
 
+def _shape_contexts(contexts: List[Dict[str, Any]], mode: str) -> List[Dict[str, Any]]:
+    """
+    Reduce retrieved contexts to the requested level of detail.
+
+    Args:
+        contexts: Contexts returned by the agent
+        mode: One of "full", "snippet", "ids" or "none"
+
+    Returns:
+        Shaped list of contexts
+    """
+    if mode == "full":
+        return contexts
+    if mode == "none":
+        return []
+
+    shaped = []
+    for ctx in contexts:
+        item = {key: value for key, value in ctx.items() if key != "text"}
+        if mode == "snippet":
+            item["snippet"] = ctx["text"][: settings.snippet_chars]
+        shaped.append(item)
+    return shaped
+
+
+def _shape_response(result: Dict[str, Any], request: QueryRequest) -> Dict[str, Any]:
+    """
+    Apply the request's context mode and field selection to an agent result.
+
+    Args:
+        result: Dictionary returned by the agent
+        request: Originating query request
+
+    Returns:
+        Response payload ready for serialization
+    """
+    payload = {
+        "response": result["response"],
+        "contexts": _shape_contexts(result["contexts"], request.context_mode),
+        "model": result["model"],
+        "num_contexts_used": result.get("num_contexts_used", len(result["contexts"])),
+        "error": result.get("error"),
+    }
+    if request.fields:
+        payload = {key: payload[key] for key in request.fields}
+    return payload
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -69,6 +162,14 @@ async def query(request: QueryRequest):
         if not request.query or not request.query.strip():
             raise HTTPException(status_code=400, detail="Query cannot be empty")
 
+        if request.fields:
+            unknown = set(request.fields) - set(QueryResponse.model_fields)
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown response fields: {', '.join(sorted(unknown))}",
+                )
+
         logger.info(f"Received query request: {request.query[:100]}...")
 
         # Generate response using the agent
@@ -78,7 +179,16 @@ async def query(request: QueryRequest):
             include_citations=request.include_citations,
         )
 
-        return QueryResponse(**result)
+        # Serialize directly with orjson, skipping response_model re-validation
+        start = time.perf_counter()
+        body = orjson.dumps(_shape_response(result, request))
+        serialize_ms = (time.perf_counter() - start) * 1000
+
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Server-Timing": f"serialize;dur={serialize_ms:.3f}"},
+        )
 
     except HTTPException:
         raise
@@ -98,24 +208,58 @@ async def list_corpora():
     return {
         "corpora": [
             {
-                "name": "legal",
-                "corpus_name": settings.legal_corpus_name,
-                "description": "Legal documents corpus",
-            },
-            {
-                "name": "technical",
-                "corpus_name": settings.technical_corpus_name,
-                "description": "Technical documents corpus",
-            },
-            {
-                "name": "training",
-                "corpus_name": settings.training_corpus_name,
-                "description": "Training documents corpus",
-            },
+                "name": entry.name,
+                "corpus_name": entry.corpus_name,
+                "description": entry.description,
+            }
+            for entry in agent.retriever.router.entries
         ]
     }
 
 
+def _resolve_workers() -> int:
+    """
+    Determine the number of worker processes.
+
+    Returns:
+        Configured worker count, or one worker per available CPU if set to 0
+    """
+    if settings.workers > 0:
+        return settings.workers
+    return len(os.sched_getaffinity(0))
+
+
+class _GunicornApplication(BaseApplication):
+    """
+    Serves the app with uvicorn workers under gunicorn's arbiter.
+
+    The arbiter replaces workers that crash or are OOM-killed. If a worker
+    fails to boot (e.g. the lifespan hook raises) the arbiter exits, so Cloud
+    Run restarts the container instead of keeping a process with no workers.
+    """
+
+    def __init__(self, application: FastAPI, options: Dict[str, Any]):
+        """
+        Initialize the gunicorn application.
+
+        Args:
+            application: ASGI app to serve
+            options: Gunicorn settings
+        """
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply the configured gunicorn settings."""
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> FastAPI:
+        """Return the app each worker serves."""
+        return self.application
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc: Exception):
     """Global exception handler."""
@@ -131,9 +275,27 @@ if __name__ == "__main__":
     logger.info(f"Project: {settings.gcp_project_id}, Region: {settings.gcp_region}")
     logger.info(f"Model: {settings.gemini_model}")
 
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=settings.port,
-        log_level=settings.log_level.lower(),
-    )
+    workers = _resolve_workers()
+    logger.info(f"Workers: {workers}")
+
+    # On SIGTERM each worker stops accepting connections and waits up to
+    # graceful_shutdown_timeout seconds for in-flight requests to finish.
+    if workers > 1:
+        _GunicornApplication(
+            app,
+            {
+                "bind": f"0.0.0.0:{settings.port}",
+                "workers": workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "graceful_timeout": settings.graceful_shutdown_timeout,
+                "loglevel": settings.log_level.lower(),
+            },
+        ).run()
+    else:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=settings.port,
+            timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
+            log_level=settings.log_level.lower(),
+        )
@@ -0,0 +1,297 @@
+"""Query embedding with cross-request micro-batching and a shared cache."""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set
+import numpy as np
+from vertexai.language_models import TextEmbeddingInput, TextEmbeddingModel
+from config import settings
+from shared_state import SharedEmbeddingCache, fingerprint, shared_path
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace and lowercase a query so equivalent queries share a cache entry."""
+    return " ".join(text.split()).lower()
+
+
+class Embedder(ABC):
+    """Base class for pluggable text embedders."""
+
+    # Identifies the model so shared files are never reused across models
+    name: str
+    # Length of the vectors returned by embed_batch()
+    dimensions: int
+
+    @abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts. Called from a worker thread.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per input text
+        """
+
+
+class VertexEmbedder(Embedder):
+    """Embedder backed by a Vertex AI text embedding model."""
+
+    def __init__(self, model_name: str):
+        """Initialize the Vertex AI embedding model."""
+        self.model = TextEmbeddingModel.from_pretrained(model_name)
+        self.name = f"vertex:{model_name}"
+        self.dimensions = settings.embedding_dimensions
+        logger.info(f"Initialized Vertex AI embedder with model: {model_name}")
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts as retrieval queries."""
+        inputs = [TextEmbeddingInput(text, "RETRIEVAL_QUERY") for text in texts]
+        return [embedding.values for embedding in self.model.get_embeddings(inputs)]
+
+
+class LocalEmbedder(Embedder):
+    """Embedder backed by a local sentence-transformers model."""
+
+    def __init__(self, model_name: str):
+        """Load the local embedding model (requires requirements-local.txt)."""
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.name = f"local:{model_name}"
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        logger.info(f"Initialized local embedder with model: {model_name}")
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        return self.model.encode(texts, normalize_embeddings=True).tolist()
+
+
+class QueryEmbeddingService:
+    """
+    Embeds each distinct query once.
+
+    Concurrent requests arriving within the batch window are embedded in a
+    single call, and identical in-flight queries share one result. Finished
+    embeddings go into a cache keyed by normalized query text that every
+    worker in the container reads and writes.
+    """
+
+    def __init__(self, embedder: Embedder, cache: Optional[SharedEmbeddingCache] = None):
+        """
+        Initialize the embedding service.
+
+        Args:
+            embedder: Embedder used to compute vectors
+            cache: Embedding cache, or None to disable caching
+        """
+        self.embedder = embedder
+        self.batch_window = settings.embedding_batch_window_ms / 1000
+        self.max_batch_size = settings.embedding_max_batch_size
+
+        self._cache = cache
+        self._dimension_mismatch_logged = False
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Running batch tasks, referenced so they are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Get the embedding for a query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector as a float32 array
+        """
+        key = normalize_query(text)
+
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            self._queue.append(key)
+
+            if len(self._queue) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await asyncio.shield(future)
+
+    async def embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts in max-size batches without touching the cache.
+
+        Used for one-off bulk work (e.g. corpus centroids) that would
+        otherwise evict hot query embeddings.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per input text
+        """
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.max_batch_size):
+            batch = texts[start : start + self.max_batch_size]
+            vectors.extend(await asyncio.to_thread(self.embedder.embed_batch, batch))
+        return vectors
+
+    def _flush(self) -> None:
+        """Send the queued texts to the embedder as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[str]) -> None:
+        """Embed a batch and resolve the waiting requests."""
+        try:
+            vectors = await asyncio.to_thread(self.embedder.embed_batch, batch)
+            if len(vectors) != len(batch):
+                raise RuntimeError(
+                    f"Embedder returned {len(vectors)} vectors for {len(batch)} queries"
+                )
+            logger.debug(f"Embedded batch of {len(batch)} queries")
+        except Exception as e:
+            logger.error(f"Error embedding query batch: {e}", exc_info=True)
+            for key in batch:
+                future = self._pending.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, values in zip(batch, vectors):
+            vector = np.asarray(values, dtype=np.float32)
+            self._store(key, vector)
+            future = self._pending.pop(key)
+            if not future.done():
+                future.set_result(vector)
+
+    def _store(self, key: str, vector: np.ndarray) -> None:
+        """Write a vector to the cache, skipping vectors of the wrong length."""
+        if self._cache is None:
+            return
+        if len(vector) != self._cache.dimensions:
+            if not self._dimension_mismatch_logged:
+                logger.warning(
+                    f"Embedder returned {len(vector)} dimensions but the cache holds "
+                    f"{self._cache.dimensions}; check EMBEDDING_DIMENSIONS. Not caching."
+                )
+                self._dimension_mismatch_logged = True
+            return
+        self._cache.put(key, vector)
+
+
+class LazyQueryEmbedding:
+    """
+    A query's embedding, computed on first request and shared afterwards.
+
+    Passed down the request pipeline so only stages that actually need the
+    vector pay for the embedding call, and it is made at most once.
+    """
+
+    def __init__(self, service: QueryEmbeddingService, query: str):
+        """
+        Initialize the lazy embedding.
+
+        Args:
+            service: Embedding service used to compute the vector
+            query: Query text
+        """
+        self.service = service
+        self.query = query
+        self._task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Optional[np.ndarray]:
+        """
+        Get the query embedding, computing it on the first call.
+
+        Returns:
+            Embedding vector, or None if embedding failed
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._embed())
+        return await asyncio.shield(self._task)
+
+    async def _embed(self) -> Optional[np.ndarray]:
+        """Embed the query, tolerating failures."""
+        try:
+            return await self.service.embed(self.query)
+        except Exception as e:
+            logger.warning(f"Query embedding failed, continuing without it: {e}")
+            return None
+
+
+def create_query_embedding_service() -> Optional[QueryEmbeddingService]:
+    """
+    Create the query embedding service from settings.
+
+    Embedding is an optimization, so a provider that cannot be set up (e.g.
+    sentence-transformers is not installed) is logged and the agent keeps
+    serving with keyword-only routing.
+
+    Returns:
+        Embedding service, or None if query embedding is disabled or unavailable
+    """
+    if not settings.query_embedding_enabled:
+        logger.info("Query embedding disabled")
+        return None
+
+    try:
+        if settings.embedding_provider == "local":
+            embedder = LocalEmbedder(settings.local_embedding_model)
+        elif settings.embedding_provider == "vertex":
+            embedder = VertexEmbedder(settings.embedding_model)
+        else:
+            raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+    except Exception as e:
+        logger.error(
+            f"Could not initialize {settings.embedding_provider} embedder, "
+            f"query embedding disabled: {e}",
+            exc_info=True,
+        )
+        return None
+
+    cache = _create_cache(embedder) if settings.embedding_cache_size > 0 else None
+    return QueryEmbeddingService(embedder, cache)
+
+
+def _create_cache(embedder: Embedder) -> SharedEmbeddingCache:
+    """
+    Open the container's shared embedding cache.
+
+    Falls back to a cache private to this process if the shared state
+    directory cannot be used.
+    """
+    capacity = settings.embedding_cache_size
+    key = fingerprint(embedder.name, embedder.dimensions, capacity)
+    try:
+        cache = SharedEmbeddingCache(
+            capacity, embedder.dimensions, shared_path(f"embeddings-{key}.bin")
+        )
+    except OSError as e:
+        logger.warning(f"Shared embedding cache unavailable, using a per-process cache: {e}")
+        return SharedEmbeddingCache(capacity, embedder.dimensions)
+
+    logger.info(f"Using shared embedding cache {cache.path}")
+    return cache
@@ -1,26 +1,40 @@
 """RAG retrieval logic for querying Vertex AI RAG corpora."""
 
+import asyncio
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional
 from google.cloud import aiplatform
 from google.cloud.aiplatform import rag
 from google.api_core import exceptions
 from config import settings
+from corpus_registry import load_corpus_registry
+from corpus_router import CorpusRouter
+from query_embedder import LazyQueryEmbedding, QueryEmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# Backoff between attempts to build the corpus routing centroids
+CENTROID_RETRY_INITIAL_SECONDS = 30
+CENTROID_RETRY_MAX_SECONDS = 900
+
 
 class RAGRetriever:
     """Retriever for querying Vertex AI RAG corpora."""
 
-    def __init__(self):
-        """Initialize the RAG retriever."""
+    def __init__(self, embedding_service: Optional[QueryEmbeddingService] = None):
+        """
+        Initialize the RAG retriever.
+
+        Args:
+            embedding_service: Optional query embedding service used to build
+                corpus routing centroids
+        """
         aiplatform.init(project=settings.gcp_project_id, location=settings.gcp_region)
-        self.corpora = [
-            settings.legal_corpus_name,
-            settings.technical_corpus_name,
-            settings.training_corpus_name,
-        ]
+        self.router = CorpusRouter(load_corpus_registry())
+        self.corpora = self.router.corpus_names
+        self.embedding_service = embedding_service
+        self._centroid_task: Optional[asyncio.Task] = None
         logger.info(f"Initialized RAG Retriever with {len(self.corpora)} corpora")
 
     async def retrieve_contexts(
@@ -28,14 +42,18 @@ class RAGRetriever:
         query: str,
         corpus_filter: Optional[List[str]] = None,
         top_k: Optional[int] = None,
+        query_embedding: Optional[LazyQueryEmbedding] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant contexts from RAG corpora.
 
         Args:
             query: User query string
-            corpus_filter: Optional list of corpus names to search (defaults to all)
+            corpus_filter: Optional list of corpus names to search (defaults to
+                the corpora the router selects for the query)
             top_k: Number of top chunks to retrieve (defaults to settings)
+            query_embedding: Lazy query embedding, resolved only if corpus
+                routing needs it
 
         Returns:
             List of retrieved contexts with text and metadata
@@ -44,7 +62,12 @@ class RAGRetriever:
             top_k = settings.top_k_chunks
 
         # Determine which corpora to search
-        corpora_to_search = corpus_filter if corpus_filter else self.corpora
+        if corpus_filter:
+            corpora_to_search = self.router.resolve(corpus_filter)
+        elif settings.corpus_routing_enabled:
+            corpora_to_search = await self.router.route(query, query_embedding=query_embedding)
+        else:
+            corpora_to_search = self.corpora
 
         try:
             logger.info(f"Retrieving contexts for query: '{query}' from {len(corpora_to_search)} corpora")
@@ -63,10 +86,12 @@ class RAGRetriever:
             contexts = []
             if hasattr(response, "contexts") and response.contexts:
                 for idx, context in enumerate(response.contexts.contexts):
+                    source = context.source_uri if hasattr(context, "source_uri") else "unknown"
                     contexts.append({
+                        "id": self._context_id(source, context.text),
                         "rank": idx + 1,
                         "text": context.text,
-                        "source": context.source_uri if hasattr(context, "source_uri") else "unknown",
+                        "source": source,
                         "distance": context.distance if hasattr(context, "distance") else None,
                     })
 
@@ -85,6 +110,51 @@ class RAGRetriever:
             logger.error(f"Error during RAG retrieval: {e}", exc_info=True)
             return []
 
+    def start_background_tasks(self) -> None:
+        """Start building the router's embedding centroids off the request path."""
+        if self.embedding_service is None or not settings.corpus_routing_enabled:
+            return
+        self._centroid_task = asyncio.get_running_loop().create_task(self._build_centroids())
+
+    async def stop_background_tasks(self) -> None:
+        """Cancel the centroid build if it is still running."""
+        if self._centroid_task is None or self._centroid_task.done():
+            return
+        self._centroid_task.cancel()
+        try:
+            await self._centroid_task
+        except asyncio.CancelledError:
+            pass
+
+    async def _build_centroids(self) -> None:
+        """Build the router's embedding centroids, retrying with exponential backoff."""
+        delay = CENTROID_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                await self.router.build_centroids(self.embedding_service)
+                return
+            except Exception as e:
+                logger.warning(
+                    f"Could not build corpus centroids, using keyword routing. "
+                    f"Retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, CENTROID_RETRY_MAX_SECONDS)
+
+    @staticmethod
+    def _context_id(source: str, text: str) -> str:
+        """
+        Build a stable identifier for a retrieved chunk.
+
+        Args:
+            source: Source URI of the chunk
+            text: Chunk text
+
+        Returns:
+            Short hex digest identifying the chunk
+        """
+        return hashlib.sha1(f"{source}\n{text}".encode("utf-8")).hexdigest()[:16]
+
     def format_contexts_for_prompt(self, contexts: List[Dict[str, Any]]) -> str:
         """
         Format retrieved contexts into a string for the prompt.
@@ -0,0 +1,191 @@
+"""Embedding state shared by the worker processes of one container."""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional
+import numpy as np
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks while another worker builds a shared file
+BUILD_POLL_SECONDS = 0.5
+
+# Per-slot header: sequence number and key hash, both uint64
+_HEADER_FIELDS = 2
+
+
+def fingerprint(*parts: object) -> str:
+    """
+    Hash the inputs a shared file is derived from.
+
+    Used in file names so workers never load state built from a different
+    model or registry.
+    """
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def shared_path(filename: str) -> str:
+    """Path of a file in the shared state directory."""
+    return os.path.join(settings.shared_state_dir, filename)
+
+
+def _key_hash(key: str) -> int:
+    """64-bit hash of a cache key. Never 0, which marks an empty slot."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class SharedEmbeddingCache:
+    """
+    Fixed-size embedding cache in a memory-mapped file shared by all workers.
+
+    Each key maps to one slot (key hash modulo capacity) holding a header and
+    a float32 vector; a new key replaces whatever the slot held. Writers take
+    an exclusive flock and make the slot's sequence number odd while writing,
+    so readers need no lock: they treat an odd or changed sequence number as
+    a miss.
+
+    Without a path the mapping is anonymous and private to this process.
+    """
+
+    def __init__(self, capacity: int, dimensions: int, path: Optional[str] = None):
+        """
+        Open or create the cache.
+
+        Args:
+            capacity: Number of slots
+            dimensions: Length of the cached vectors
+            path: File backing the cache, or None for a private cache
+        """
+        self.capacity = capacity
+        self.dimensions = dimensions
+        self.path = path
+
+        header_bytes = capacity * _HEADER_FIELDS * 8
+        size = header_bytes + capacity * dimensions * 4
+
+        self._fd: Optional[int] = None
+        if path is None:
+            self._mmap = mmap.mmap(-1, size)
+        else:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            with self._locked():
+                if os.fstat(self._fd).st_size < size:
+                    os.ftruncate(self._fd, size)
+            self._mmap = mmap.mmap(self._fd, size)
+
+        self._headers = np.ndarray(
+            (capacity, _HEADER_FIELDS), dtype=np.uint64, buffer=self._mmap
+        )
+        self._vectors = np.ndarray(
+            (capacity, dimensions), dtype=np.float32, buffer=self._mmap, offset=header_bytes
+        )
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cross-process write lock (a no-op for private caches)."""
+        if self._fd is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a cached vector.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Copy of the cached vector, or None on a miss
+        """
+        key_hash = _key_hash(key)
+        slot = key_hash % self.capacity
+
+        sequence = int(self._headers[slot, 0])
+        if sequence % 2 or int(self._headers[slot, 1]) != key_hash:
+            return None
+        vector = self._vectors[slot].copy()
+        if int(self._headers[slot, 0]) != sequence:
+            return None
+        return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """
+        Store a vector, replacing the slot's previous entry.
+
+        Args:
+            key: Cache key
+            vector: float32 vector of the cache's dimensions
+        """
+        if vector.shape != (self.dimensions,):
+            raise ValueError(
+                f"Expected a vector of {self.dimensions} dimensions, got shape {vector.shape}"
+            )
+
+        key_hash = _key_hash(key)
+        slot = key_hash % self.capacity
+
+        # Writes hold the lock for a few microseconds, so blocking is acceptable
+        with self._locked():
+            sequence = int(self._headers[slot, 0])
+            self._headers[slot, 0] = sequence + 1
+            self._headers[slot, 1] = key_hash
+            self._vectors[slot] = vector
+            self._headers[slot, 0] = sequence + 2
+
+
+async def load_or_build_array(
+    path: str, build: Callable[[], Awaitable[np.ndarray]]
+) -> np.ndarray:
+    """
+    Load an array saved by another worker, or build and save it.
+
+    One worker builds at a time while the others wait for its file. If the
+    builder fails or dies its lock is released and a waiting worker takes
+    over. The file is written to a temporary name and renamed into place, so
+    readers never see a partial array.
+
+    Args:
+        path: File the array is shared through
+        build: Coroutine function computing the array
+
+    Returns:
+        The shared array
+    """
+    while True:
+        if os.path.exists(path):
+            return np.load(path)
+
+        try:
+            lock_file = open(f"{path}.lock", "a")
+        except OSError as e:
+            logger.warning(f"Cannot share {path}, building it in this worker: {e}")
+            return await build()
+
+        with lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                pass
+            else:
+                if os.path.exists(path):
+                    return np.load(path)
+                array = await build()
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, array)
+                os.replace(tmp_path, path)
+                return array
+
+        await asyncio.sleep(BUILD_POLL_SECONDS)
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     technical_corpus_name: str = os.getenv("TECHNICAL_CORPUS_NAME", "")
     training_corpus_name: str = os.getenv("TRAINING_CORPUS_NAME", "")
 
+    # Corpus Registry (inline JSON takes precedence over the file path)
+    corpus_registry: str = os.getenv("CORPUS_REGISTRY", "")
+    corpus_registry_path: str = os.getenv("CORPUS_REGISTRY_PATH", "")
+
     # Storage Configuration
     documents_bucket: str = os.getenv("DOCUMENTS_BUCKET", "")
 
@@ -24,6 +28,9 @@ class Settings(BaseSettings):
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
 
+    # Stats Configuration
+    stats_window_seconds: int = int(os.getenv("STATS_WINDOW_SECONDS", "300"))
+
     # Server Configuration
     port: int = int(os.getenv("PORT", "8080"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
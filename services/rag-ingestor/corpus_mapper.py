@@ -1,22 +1,92 @@
 """Corpus mapping logic for determining which corpus to use based on folder path."""
 
 import logging
-from typing import Optional
-from config import settings
+from typing import Any, Dict, List, Optional, Tuple
+from corpus_registry import CorpusEntry, load_corpus_registry
 
 logger = logging.getLogger(__name__)
 
+# Key under which a trie node stores the (folder, corpus_name) it terminates
+_TERMINAL = "\0"
+
 
 class CorpusMapper:
     """Maps GCS folder paths to Vertex AI RAG corpus names."""
 
-    def __init__(self):
-        """Initialize the corpus mapper with configured corpus names."""
-        self.folder_to_corpus = {
-            "legal/": settings.legal_corpus_name,
-            "technical/": settings.technical_corpus_name,
-            "training/": settings.training_corpus_name,
-        }
+    def __init__(self, entries: Optional[List[CorpusEntry]] = None):
+        """
+        Initialize the corpus mapper from the corpus registry.
+
+        Args:
+            entries: Registered corpora (defaults to the configured registry)
+        """
+        if entries is None:
+            entries = load_corpus_registry()
+
+        self.folder_to_corpus: Dict[str, str] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for entry in entries:
+            if not entry.corpus_name:
+                logger.warning(f"Corpus '{entry.name}' has no corpus name, skipping")
+                continue
+            for prefix in entry.prefixes:
+                self._insert(prefix, entry.corpus_name)
+
+        logger.info(
+            f"Initialized corpus mapper with {len(self.folder_to_corpus)} "
+            f"folder prefixes"
+        )
+
+    def _insert(self, prefix: str, corpus_name: str) -> None:
+        """
+        Add a folder prefix to the routing trie.
+
+        Prefixes are matched on whole path segments, so "legal/" routes
+        "legal/doc.pdf" but not "legalese/doc.pdf".
+
+        Args:
+            prefix: Folder prefix (e.g., "legal/" or "hr/emea/")
+            corpus_name: Corpus that objects under the prefix are imported to
+        """
+        folder = prefix.strip("/")
+        if not folder:
+            logger.warning(f"Ignoring empty folder prefix for corpus {corpus_name}")
+            return
+
+        existing = self.folder_to_corpus.get(f"{folder}/")
+        if existing and existing != corpus_name:
+            logger.warning(
+                f"Folder prefix '{folder}/' remapped from {existing} to {corpus_name}"
+            )
+        self.folder_to_corpus[f"{folder}/"] = corpus_name
+
+        node = self._trie
+        for segment in folder.split("/"):
+            node = node.setdefault(segment, {})
+        node[_TERMINAL] = (folder, corpus_name)
+
+    def _match(self, gcs_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Find the longest registered folder prefix containing the object.
+
+        Args:
+            gcs_path: Full GCS path of the object
+
+        Returns:
+            Tuple of (folder, corpus_name) for the deepest match, None otherwise
+        """
+        # Only directory segments take part in routing, never the file name
+        segments = gcs_path.split("/")[:-1]
+
+        node = self._trie
+        match = None
+        for segment in segments:
+            node = node.get(segment)
+            if node is None:
+                break
+            match = node.get(_TERMINAL, match)
+        return match
 
     def get_corpus_name(self, gcs_path: str) -> Optional[str]:
         """
@@ -28,10 +98,11 @@ class CorpusMapper:
         Returns:
             Corpus name if path matches a known folder, None otherwise
         """
-        for folder, corpus_name in self.folder_to_corpus.items():
-            if gcs_path.startswith(folder):
-                logger.info(f"Mapped path '{gcs_path}' to corpus '{corpus_name}'")
-                return corpus_name
+        match = self._match(gcs_path)
+        if match:
+            corpus_name = match[1]
+            logger.info(f"Mapped path '{gcs_path}' to corpus '{corpus_name}'")
+            return corpus_name
 
         logger.warning(f"No corpus mapping found for path: {gcs_path}")
         return None
@@ -46,7 +117,5 @@ class CorpusMapper:
         Returns:
             Folder name if found, None otherwise
         """
-        for folder in self.folder_to_corpus.keys():
-            if gcs_path.startswith(folder):
-                return folder.rstrip("/")
-        return None
+        match = self._match(gcs_path)
+        return match[0] if match else None
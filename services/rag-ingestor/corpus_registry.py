@@ -0,0 +1,120 @@
+"""Corpus registry loading for the rag-ingestor service."""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, List
+from pydantic import TypeAdapter, ValidationError
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorpusEntry:
+    """A single corpus registered with the ingestor."""
+
+    name: str
+    corpus_name: str
+    prefixes: List[str] = field(default_factory=list)
+    description: str = ""
+
+
+_ENTRY_ADAPTER = TypeAdapter(CorpusEntry)
+
+
+def _default_registry() -> List[CorpusEntry]:
+    """Build the legacy three-corpus registry from individual settings."""
+    return [
+        CorpusEntry(
+            name="legal",
+            corpus_name=settings.legal_corpus_name,
+            prefixes=["legal/"],
+            description="Legal documents corpus",
+        ),
+        CorpusEntry(
+            name="technical",
+            corpus_name=settings.technical_corpus_name,
+            prefixes=["technical/"],
+            description="Technical documents corpus",
+        ),
+        CorpusEntry(
+            name="training",
+            corpus_name=settings.training_corpus_name,
+            prefixes=["training/"],
+            description="Training documents corpus",
+        ),
+    ]
+
+
+def _registry_items(raw: Any, source: str) -> List[Any]:
+    """Return the raw entries of a parsed registry, checking its top-level shape."""
+    if not isinstance(raw, dict) or not isinstance(raw.get("corpora", []), list):
+        raise ValueError(f'Corpus registry in {source} must be an object with a "corpora" list')
+    return raw.get("corpora", [])
+
+
+def _validate_entry(index: int, item: Any, source: str) -> CorpusEntry:
+    """
+    Validate one raw registry entry.
+
+    Keys used only by the other service are ignored, so both services can
+    read the same registry file.
+
+    Raises:
+        ValueError: Naming the entry and the fields that failed validation
+    """
+    try:
+        return _ENTRY_ADAPTER.validate_python(item)
+    except ValidationError as e:
+        name = item.get("name") if isinstance(item, dict) else None
+        label = f"#{index}" + (f" ({name!r})" if name else "")
+        raise ValueError(f"Invalid corpus registry entry {label} in {source}: {e}") from e
+
+
+def load_corpus_registry() -> List[CorpusEntry]:
+    """
+    Load the corpus registry.
+
+    The registry is read from the inline ``CORPUS_REGISTRY`` JSON setting if
+    present, otherwise from the file at ``CORPUS_REGISTRY_PATH``. When neither
+    is configured, the legacy legal/technical/training corpora are used.
+
+    Expected format:
+    {
+        "corpora": [
+            {
+                "name": "legal",
+                "corpus_name": "projects/.../ragCorpora/...",
+                "prefixes": ["legal/"],
+                "description": "...",
+                ...
+            }
+        ]
+    }
+
+    Returns:
+        List of registered corpora
+
+    Raises:
+        ValueError: If the registry or one of its entries is malformed
+    """
+    if settings.corpus_registry:
+        raw = json.loads(settings.corpus_registry)
+        source = "CORPUS_REGISTRY"
+    elif settings.corpus_registry_path:
+        with open(settings.corpus_registry_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        source = settings.corpus_registry_path
+    else:
+        logger.info("No corpus registry configured, using default corpora")
+        return _default_registry()
+
+    entries = []
+    for index, item in enumerate(_registry_items(raw, source)):
+        entry = _validate_entry(index, item, source)
+        entry.prefixes = entry.prefixes or [f"{entry.name}/"]
+        entries.append(entry)
+
+    logger.info(f"Loaded {len(entries)} corpora from {source}")
+    return entries
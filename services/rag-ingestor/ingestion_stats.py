@@ -0,0 +1,282 @@
+"""Per-corpus ingestion counters, import durations and rolling throughput."""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+from config import settings
+
+# Stats key for events whose object path matches no corpus
+UNMAPPED = "_unmapped"
+
+
+def object_id(bucket: str, name: str, generation: Optional[str]) -> str:
+    """
+    Identify one uploaded version of a GCS object.
+
+    Pub/Sub redelivers an event after every failed attempt, so received and
+    failed entries repeat for the same upload. Keying entries by object
+    generation lets those retries be deduplicated.
+    """
+    return f"gs://{bucket}/{name}#{generation or ''}"
+
+
+def emit_ingestion_event(
+    outcome: str, corpus: Optional[str], object_key: str, **fields: Any
+) -> None:
+    """
+    Write a structured ingestion log entry to stdout.
+
+    Cloud Run parses JSON lines on stdout into jsonPayload, so these entries
+    feed the log-based metrics defined in Terraform and aggregate across
+    every instance, unlike the in-memory counters below.
+
+    Args:
+        outcome: received, import_started, skipped_placeholder,
+            skipped_unmapped, imported or failed
+        corpus: Corpus the object mapped to, None if unmapped
+        object_key: Value of object_id() for the event's object
+        **fields: Extra payload fields (bytes, duration_seconds, ...)
+    """
+    entry = {
+        "severity": "INFO",
+        "message": f"ingestion {outcome}",
+        "event": "ingestion",
+        "outcome": outcome,
+        "corpus": corpus or UNMAPPED,
+        "object": object_key,
+        **fields,
+    }
+    sys.stdout.write(json.dumps(entry) + "\n")
+    sys.stdout.flush()
+
+
+@dataclass
+class CorpusStats:
+    """Counters for a single corpus."""
+
+    received: int = 0
+    skipped_placeholder: int = 0
+    skipped_unmapped: int = 0
+    importing: int = 0
+    imported: int = 0
+    failed: int = 0
+    bytes_processed: int = 0
+    imported_rag_files_count: int = 0
+    import_seconds_total: float = 0.0
+    import_seconds_max: float = 0.0
+
+
+class IngestionStats:
+    """
+    In-memory ingestion statistics for this instance only.
+
+    Counters are cumulative since process start and reset when the instance
+    is shut down. received and failed count delivery attempts, so a
+    redelivered event is counted again. Throughput is computed over the last
+    ``stats_window_seconds`` of completed imports. Every update is also
+    emitted as a structured log entry so service-wide totals can be
+    aggregated in Cloud Monitoring.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.started_at = time.time()
+        self.window_seconds = settings.stats_window_seconds
+        self.corpora: Dict[str, CorpusStats] = {}
+        # (finished_at, corpus, bytes) for each successful import in the window
+        self._completions: Deque[Tuple[float, str, int]] = deque()
+
+    def _corpus(self, corpus: Optional[str]) -> CorpusStats:
+        """Get or create the counters for a corpus."""
+        key = corpus or UNMAPPED
+        stats = self.corpora.get(key)
+        if stats is None:
+            stats = self.corpora[key] = CorpusStats()
+        return stats
+
+    def record_received(self, corpus: Optional[str], object_key: str, size_bytes: int) -> None:
+        """Record an incoming object finalize event."""
+        self._corpus(corpus).received += 1
+        emit_ingestion_event("received", corpus, object_key, bytes=size_bytes)
+
+    def record_skipped(self, corpus: Optional[str], object_key: str, reason: str) -> None:
+        """
+        Record a skipped event.
+
+        Args:
+            corpus: Corpus the object mapped to, None if unmapped
+            object_key: Value of object_id() for the event's object
+            reason: "placeholder" or "unmapped"
+        """
+        stats = self._corpus(corpus)
+        if reason == "placeholder":
+            stats.skipped_placeholder += 1
+        else:
+            stats.skipped_unmapped += 1
+        emit_ingestion_event(f"skipped_{reason}", corpus, object_key)
+
+    def import_started(self, corpus: str, object_key: str) -> float:
+        """
+        Record the start of a document import.
+
+        Returns:
+            Start timestamp to pass to import_finished()
+        """
+        self._corpus(corpus).importing += 1
+        emit_ingestion_event("import_started", corpus, object_key)
+        return time.monotonic()
+
+    def import_finished(
+        self,
+        corpus: str,
+        object_key: str,
+        started: float,
+        size_bytes: int,
+        imported_files: Optional[int],
+    ) -> None:
+        """
+        Record the end of a document import.
+
+        Args:
+            corpus: Corpus the document was imported to
+            object_key: Value of object_id() for the document
+            started: Value returned by import_started()
+            size_bytes: Size of the source object
+            imported_files: imported_rag_files_count on success, None on failure
+        """
+        duration = time.monotonic() - started
+        stats = self._corpus(corpus)
+        stats.importing -= 1
+        stats.import_seconds_total += duration
+        stats.import_seconds_max = max(stats.import_seconds_max, duration)
+
+        if imported_files is None:
+            stats.failed += 1
+            emit_ingestion_event(
+                "failed", corpus, object_key, bytes=size_bytes, duration_seconds=duration
+            )
+            return
+
+        stats.imported += 1
+        stats.bytes_processed += size_bytes
+        stats.imported_rag_files_count += imported_files
+        self._completions.append((time.time(), corpus, size_bytes))
+        emit_ingestion_event(
+            "imported",
+            corpus,
+            object_key,
+            bytes=size_bytes,
+            duration_seconds=duration,
+            imported_rag_files_count=imported_files,
+        )
+
+    def _trim_window(self, now: float) -> None:
+        """Drop completions older than the rolling window."""
+        cutoff = now - self.window_seconds
+        while self._completions and self._completions[0][0] < cutoff:
+            self._completions.popleft()
+
+    def _throughput(self, now: float) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Compute rolling per-minute throughput.
+
+        Returns:
+            Tuple of (overall rates, documents per minute by corpus)
+        """
+        self._trim_window(now)
+        # Use the elapsed time if the process is younger than the window
+        minutes = max(min(self.window_seconds, now - self.started_at), 1.0) / 60
+
+        docs_by_corpus: Dict[str, float] = {}
+        total_bytes = 0
+        for _, corpus, size in self._completions:
+            docs_by_corpus[corpus] = docs_by_corpus.get(corpus, 0) + 1
+            total_bytes += size
+
+        # Chunk counts are not returned by import_files, so estimate them from
+        # source bytes assuming roughly one byte per character of text.
+        chunk_stride = max(settings.chunk_size - settings.chunk_overlap, 1)
+
+        overall = {
+            "docs_per_min": len(self._completions) / minutes,
+            "bytes_per_min": total_bytes / minutes,
+            "estimated_chunks_per_min": total_bytes / chunk_stride / minutes,
+        }
+        return overall, {corpus: docs / minutes for corpus, docs in docs_by_corpus.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable view of this instance's statistics.
+
+        Returns:
+            Dictionary with totals, per-corpus counters and throughput
+        """
+        now = time.time()
+        throughput, docs_per_min_by_corpus = self._throughput(now)
+
+        totals = CorpusStats()
+        corpora = {}
+        for name, stats in self.corpora.items():
+            for field_name, value in asdict(stats).items():
+                setattr(totals, field_name, getattr(totals, field_name) + value)
+            finished = stats.imported + stats.failed
+            corpora[name] = {
+                **asdict(stats),
+                "avg_import_seconds": stats.import_seconds_total / finished if finished else None,
+                "docs_per_min": docs_per_min_by_corpus.get(name, 0.0),
+            }
+        totals.import_seconds_max = max(
+            (stats.import_seconds_max for stats in self.corpora.values()), default=0.0
+        )
+
+        return {
+            "scope": "instance",
+            "revision": os.getenv("K_REVISION", ""),
+            "uptime_seconds": now - self.started_at,
+            "window_seconds": self.window_seconds,
+            "totals": asdict(totals),
+            "throughput": throughput,
+            "corpora": corpora,
+        }
+
+    def prometheus(self) -> str:
+        """
+        Render this instance's statistics in Prometheus text exposition format.
+
+        Returns:
+            Metrics text
+        """
+        throughput, _ = self._throughput(time.time())
+        counters = [
+            ("received", "events_received_total", "Object finalize events received"),
+            ("skipped_placeholder", "events_skipped_placeholder_total", "Placeholder objects skipped"),
+            ("skipped_unmapped", "events_skipped_unmapped_total", "Objects skipped with no corpus mapping"),
+            ("imported", "documents_imported_total", "Documents imported successfully"),
+            ("failed", "documents_failed_total", "Document imports that failed"),
+            ("bytes_processed", "bytes_processed_total", "Source bytes imported"),
+            ("imported_rag_files_count", "rag_files_imported_total", "RAG files reported by import_files"),
+            ("import_seconds_total", "import_seconds_total", "Total time spent importing"),
+        ]
+
+        lines = []
+        for attr, metric, help_text in counters:
+            lines.append(f"# HELP rag_ingestor_{metric} {help_text}")
+            lines.append(f"# TYPE rag_ingestor_{metric} counter")
+            for corpus, stats in self.corpora.items():
+                lines.append(f'rag_ingestor_{metric}{{corpus="{corpus}"}} {getattr(stats, attr)}')
+
+        lines.append("# HELP rag_ingestor_imports_in_progress Document imports currently running")
+        lines.append("# TYPE rag_ingestor_imports_in_progress gauge")
+        for corpus, stats in self.corpora.items():
+            lines.append(f'rag_ingestor_imports_in_progress{{corpus="{corpus}"}} {stats.importing}')
+
+        for name, value in throughput.items():
+            lines.append(f"# HELP rag_ingestor_{name} Rolling {name.replace('_', ' ')}")
+            lines.append(f"# TYPE rag_ingestor_{name} gauge")
+            lines.append(f"rag_ingestor_{name} {value}")
+
+        return "\n".join(lines) + "\n"
@@ -4,11 +4,12 @@ import logging
 import sys
 from typing import Dict, Any
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
 from config import settings
 from corpus_mapper import CorpusMapper
+from ingestion_stats import IngestionStats, object_id
 from vertex_client import VertexRAGClient
 
 # Configure logging
@@ -29,6 +30,7 @@ app = FastAPI(
 # Initialize services
 corpus_mapper = CorpusMapper()
 vertex_client = VertexRAGClient()
+ingestion_stats = IngestionStats()
 
 
 @app.get("/health")
@@ -37,6 +39,26 @@ async def health_check():
     return {"status": "healthy", "service": "rag-ingestor"}
 
 
+@app.get("/stats")
+async def get_stats():
+    """
+    Ingestion statistics for the instance that serves the request.
+
+    This is a per-instance debug view that resets on restart; service-wide
+    totals come from the log-based metrics in Cloud Monitoring.
+
+    Returns:
+        Per-corpus counters, import durations and rolling throughput
+    """
+    return {"service": "rag-ingestor", **ingestion_stats.snapshot()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-instance ingestion statistics in Prometheus text format."""
+    return ingestion_stats.prometheus()
+
+
 @app.post("/")
 async def handle_eventarc_event(request: Request):
     """
@@ -54,6 +76,7 @@ async def handle_eventarc_event(request: Request):
             "bucket": "BUCKET_NAME",
             "name": "OBJECT_NAME",
             "contentType": "...",
+            "generation": "...",
             ...
         }
     }
@@ -68,22 +91,28 @@ async def handle_eventarc_event(request: Request):
         bucket_name = data.get("bucket")
         object_name = data.get("name")
         content_type = data.get("contentType", "")
+        size_bytes = int(data.get("size") or 0)
 
         if not bucket_name or not object_name:
             logger.error("Missing bucket or object name in event data")
             raise HTTPException(status_code=400, detail="Invalid event data")
 
+        # Determine the corpus based on the folder path
+        corpus_name = corpus_mapper.get_corpus_name(object_name)
+        object_key = object_id(bucket_name, object_name, data.get("generation"))
+        ingestion_stats.record_received(corpus_name, object_key, size_bytes)
+
         # Skip if it's a folder placeholder (.keep files)
         if object_name.endswith("/.keep") or object_name.endswith(".keep"):
             logger.info(f"Skipping placeholder file: {object_name}")
+            ingestion_stats.record_skipped(corpus_name, object_key, "placeholder")
             return {"status": "skipped", "reason": "placeholder file"}
 
         logger.info(f"Processing file: gs://{bucket_name}/{object_name}")
 
-        # Determine the corpus based on the folder path
-        corpus_name = corpus_mapper.get_corpus_name(object_name)
         if not corpus_name:
             logger.warning(f"No corpus mapping for object: {object_name}")
+            ingestion_stats.record_skipped(corpus_name, object_key, "unmapped")
             return {
                 "status": "skipped",
                 "reason": "no corpus mapping",
@@ -97,13 +126,20 @@ async def handle_eventarc_event(request: Request):
         display_name = object_name.split("/")[-1]
 
         # Import the document to Vertex AI RAG
-        success = await vertex_client.import_document(
-            corpus_name=corpus_name,
-            gcs_uri=gcs_uri,
-            display_name=display_name,
-        )
-
-        if success:
+        started = ingestion_stats.import_started(corpus_name, object_key)
+        imported_files = None
+        try:
+            imported_files = await vertex_client.import_document(
+                corpus_name=corpus_name,
+                gcs_uri=gcs_uri,
+                display_name=display_name,
+            )
+        finally:
+            ingestion_stats.import_finished(
+                corpus_name, object_key, started, size_bytes, imported_files
+            )
+
+        if imported_files is not None:
             logger.info(f"Successfully processed document: {display_name}")
             return {
                 "status": "success",
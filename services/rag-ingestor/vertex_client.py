@@ -29,7 +29,7 @@ class VertexRAGClient:
     )
     async def import_document(
         self, corpus_name: str, gcs_uri: str, display_name: str
-    ) -> bool:
+    ) -> Optional[int]:
         """
         Import a document into a Vertex AI RAG corpus.
 
@@ -39,7 +39,7 @@ class VertexRAGClient:
             display_name: Display name for the document
 
         Returns:
-            True if successful, False otherwise
+            Number of imported RAG files if successful, None otherwise
         """
         try:
             logger.info(f"Importing document '{display_name}' from {gcs_uri} to corpus {corpus_name}")
@@ -56,16 +56,16 @@ class VertexRAGClient:
                 f"Successfully imported document '{display_name}' "
                 f"(imported {response.imported_rag_files_count} files)"
             )
-            return True
+            return response.imported_rag_files_count
 
         except exceptions.NotFound as e:
             logger.error(f"Corpus not found: {corpus_name}. Error: {e}")
             logger.info("You may need to create the corpus first. See README for instructions.")
-            return False
+            return None
 
         except exceptions.InvalidArgument as e:
             logger.error(f"Invalid argument when importing document: {e}")
-            return False
+            return None
 
         except exceptions.GoogleAPIError as e:
             logger.error(f"Google API error during document import: {e}")
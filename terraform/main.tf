@@ -62,6 +62,7 @@ module "cloud_run" {
   documents_bucket_name = module.storage.bucket_name
   gemini_model          = var.gemini_model
   top_k_chunks          = var.top_k_chunks
+  corpus_registry_json  = length(var.corpus_registry) > 0 ? jsonencode({ corpora = var.corpus_registry }) : ""
 
   depends_on = [module.iam, module.vertex_ai]
 }
@@ -79,3 +80,11 @@ module "eventarc" {
 
   depends_on = [module.cloud_run, module.storage]
 }
+
+# Monitoring Module - Log-based ingestion metrics and dashboard
+module "monitoring" {
+  source = "./modules/monitoring"
+
+  project_id             = var.project_id
+  ingestion_subscription = module.eventarc.trigger_subscription
+}
@@ -1,5 +1,41 @@
 # Cloud Run Module - RAG Services
 
+locals {
+  corpus_registry_enabled = var.corpus_registry_json != ""
+  corpus_registry_dir     = "/etc/corpus-registry"
+}
+
+# Corpus registry shared by both services, mounted as the same file in each
+resource "google_secret_manager_secret" "corpus_registry" {
+  count     = local.corpus_registry_enabled ? 1 : 0
+  project   = var.project_id
+  secret_id = "corpus-registry"
+
+  replication {
+    auto {}
+  }
+
+  labels = var.labels
+}
+
+resource "google_secret_manager_secret_version" "corpus_registry" {
+  count       = local.corpus_registry_enabled ? 1 : 0
+  secret      = google_secret_manager_secret.corpus_registry[0].id
+  secret_data = var.corpus_registry_json
+}
+
+resource "google_secret_manager_secret_iam_member" "corpus_registry_accessor" {
+  for_each = local.corpus_registry_enabled ? {
+    rag_ingestor = var.rag_ingestor_sa_email
+    adk_agent    = var.adk_agent_sa_email
+  } : {}
+
+  project   = var.project_id
+  secret_id = google_secret_manager_secret.corpus_registry[0].secret_id
+  role      = "roles/secretmanager.secretAccessor"
+  member    = "serviceAccount:${each.value}"
+}
+
 # Cloud Run Service - rag-ingestor
 resource "google_cloud_run_v2_service" "rag_ingestor" {
   name     = "rag-ingestor"
@@ -16,6 +52,21 @@ resource "google_cloud_run_v2_service" "rag_ingestor" {
 
     timeout = "${var.rag_ingestor_config.timeout_seconds}s"
 
+    # Pinned to the current version so registry changes roll out a new revision
+    dynamic "volumes" {
+      for_each = local.corpus_registry_enabled ? [1] : []
+      content {
+        name = "corpus-registry"
+        secret {
+          secret = google_secret_manager_secret.corpus_registry[0].secret_id
+          items {
+            version = google_secret_manager_secret_version.corpus_registry[0].version
+            path    = "corpora.json"
+          }
+        }
+      }
+    }
+
     containers {
       image = var.docker_image_rag_ingestor
 
@@ -68,6 +119,22 @@ resource "google_cloud_run_v2_service" "rag_ingestor" {
         value = "8080"
       }
 
+      dynamic "env" {
+        for_each = local.corpus_registry_enabled ? [1] : []
+        content {
+          name  = "CORPUS_REGISTRY_PATH"
+          value = "${local.corpus_registry_dir}/corpora.json"
+        }
+      }
+
+      dynamic "volume_mounts" {
+        for_each = local.corpus_registry_enabled ? [1] : []
+        content {
+          name       = "corpus-registry"
+          mount_path = local.corpus_registry_dir
+        }
+      }
+
       startup_probe {
         http_get {
           path = "/health"
@@ -98,6 +165,8 @@ resource "google_cloud_run_v2_service" "rag_ingestor" {
   }
 
   labels = var.labels
+
+  depends_on = [google_secret_manager_secret_iam_member.corpus_registry_accessor]
 }
 
 # IAM policy to allow Eventarc to invoke rag-ingestor (will be bound in Eventarc module)
@@ -124,6 +193,21 @@ resource "google_cloud_run_v2_service" "adk_agent" {
 
     timeout = "${var.adk_agent_config.timeout_seconds}s"
 
+    # Pinned to the current version so registry changes roll out a new revision
+    dynamic "volumes" {
+      for_each = local.corpus_registry_enabled ? [1] : []
+      content {
+        name = "corpus-registry"
+        secret {
+          secret = google_secret_manager_secret.corpus_registry[0].secret_id
+          items {
+            version = google_secret_manager_secret_version.corpus_registry[0].version
+            path    = "corpora.json"
+          }
+        }
+      }
+    }
+
     containers {
       image = var.docker_image_adk_agent
 
@@ -181,6 +265,29 @@ resource "google_cloud_run_v2_service" "adk_agent" {
         value = "8080"
       }
 
+      # One uvicorn worker per allocated vCPU; the agent accepts whole CPUs,
+      # fractions ("0.5") and millicores ("1000m")
+      env {
+        name  = "WORKERS"
+        value = var.adk_agent_config.cpu
+      }
+
+      dynamic "env" {
+        for_each = local.corpus_registry_enabled ? [1] : []
+        content {
+          name  = "CORPUS_REGISTRY_PATH"
+          value = "${local.corpus_registry_dir}/corpora.json"
+        }
+      }
+
+      dynamic "volume_mounts" {
+        for_each = local.corpus_registry_enabled ? [1] : []
+        content {
+          name       = "corpus-registry"
+          mount_path = local.corpus_registry_dir
+        }
+      }
+
       startup_probe {
         http_get {
           path = "/health"
@@ -211,6 +318,8 @@ resource "google_cloud_run_v2_service" "adk_agent" {
   }
 
   labels = var.labels
+
+  depends_on = [google_secret_manager_secret_iam_member.corpus_registry_accessor]
 }
 
 # IAM policy to allow authenticated users to invoke adk-agent
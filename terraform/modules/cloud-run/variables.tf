@@ -84,6 +84,12 @@ variable "gemini_model" {
   type        = string
 }
 
+variable "corpus_registry_json" {
+  description = "Corpus registry JSON mounted into both services (empty to use the three default corpora)"
+  type        = string
+  default     = ""
+}
+
 variable "top_k_chunks" {
   description = "Number of top chunks to retrieve"
   type        = number
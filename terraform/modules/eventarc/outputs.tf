@@ -7,3 +7,8 @@ output "trigger_id" {
   description = "ID of the Eventarc trigger"
   value       = google_eventarc_trigger.gcs_rag_ingestor.id
 }
+
+output "trigger_subscription" {
+  description = "Pub/Sub subscription backing the trigger (its undelivered messages are the ingestion queue)"
+  value       = google_eventarc_trigger.gcs_rag_ingestor.transport[0].pubsub[0].subscription
+}
@@ -0,0 +1,225 @@
+# Monitoring Module - Log-based metrics and dashboard for rag-ingestor
+
+locals {
+  # Structured ingestion events written to stdout by rag-ingestor
+  ingestion_filter = <<-EOT
+    resource.type="cloud_run_revision"
+    resource.labels.service_name="rag-ingestor"
+    jsonPayload.event="ingestion"
+  EOT
+
+  corpus_label = {
+    key         = "corpus"
+    value_type  = "STRING"
+    description = "Corpus the object mapped to (_unmapped if none)"
+  }
+}
+
+# Count of ingestion events by corpus and outcome
+# (received, import_started, skipped_placeholder, skipped_unmapped, imported, failed)
+resource "google_logging_metric" "ingestion_events" {
+  name    = "rag_ingestor/ingestion_events"
+  project = var.project_id
+  filter  = local.ingestion_filter
+
+  metric_descriptor {
+    metric_kind = "DELTA"
+    value_type  = "INT64"
+    unit        = "1"
+
+    labels {
+      key         = local.corpus_label.key
+      value_type  = local.corpus_label.value_type
+      description = local.corpus_label.description
+    }
+
+    labels {
+      key         = "outcome"
+      value_type  = "STRING"
+      description = "Ingestion outcome"
+    }
+  }
+
+  label_extractors = {
+    corpus  = "EXTRACT(jsonPayload.corpus)"
+    outcome = "EXTRACT(jsonPayload.outcome)"
+  }
+}
+
+# Import duration by corpus and outcome (imported or failed)
+resource "google_logging_metric" "import_duration" {
+  name    = "rag_ingestor/import_duration"
+  project = var.project_id
+  filter  = "${local.ingestion_filter} jsonPayload.outcome=(\"imported\" OR \"failed\")"
+
+  metric_descriptor {
+    metric_kind = "DELTA"
+    value_type  = "DISTRIBUTION"
+    unit        = "s"
+
+    labels {
+      key         = local.corpus_label.key
+      value_type  = local.corpus_label.value_type
+      description = local.corpus_label.description
+    }
+
+    labels {
+      key         = "outcome"
+      value_type  = "STRING"
+      description = "Ingestion outcome"
+    }
+  }
+
+  value_extractor = "EXTRACT(jsonPayload.duration_seconds)"
+
+  label_extractors = {
+    corpus  = "EXTRACT(jsonPayload.corpus)"
+    outcome = "EXTRACT(jsonPayload.outcome)"
+  }
+
+  bucket_options {
+    exponential_buckets {
+      num_finite_buckets = 20
+      growth_factor      = 2
+      scale              = 0.1
+    }
+  }
+}
+
+# Source bytes of successfully imported documents (use the distribution sum)
+resource "google_logging_metric" "bytes_processed" {
+  name    = "rag_ingestor/bytes_processed"
+  project = var.project_id
+  filter  = "${local.ingestion_filter} jsonPayload.outcome=\"imported\""
+
+  metric_descriptor {
+    metric_kind = "DELTA"
+    value_type  = "DISTRIBUTION"
+    unit        = "By"
+
+    labels {
+      key         = local.corpus_label.key
+      value_type  = local.corpus_label.value_type
+      description = local.corpus_label.description
+    }
+  }
+
+  value_extractor = "EXTRACT(jsonPayload.bytes)"
+
+  label_extractors = {
+    corpus = "EXTRACT(jsonPayload.corpus)"
+  }
+
+  bucket_options {
+    exponential_buckets {
+      num_finite_buckets = 24
+      growth_factor      = 2
+      scale              = 1024
+    }
+  }
+}
+
+# imported_rag_files_count reported by Vertex AI (use the distribution sum)
+resource "google_logging_metric" "rag_files_imported" {
+  name    = "rag_ingestor/rag_files_imported"
+  project = var.project_id
+  filter  = "${local.ingestion_filter} jsonPayload.outcome=\"imported\""
+
+  metric_descriptor {
+    metric_kind = "DELTA"
+    value_type  = "DISTRIBUTION"
+    unit        = "1"
+
+    labels {
+      key         = local.corpus_label.key
+      value_type  = local.corpus_label.value_type
+      description = local.corpus_label.description
+    }
+  }
+
+  value_extractor = "EXTRACT(jsonPayload.imported_rag_files_count)"
+
+  label_extractors = {
+    corpus = "EXTRACT(jsonPayload.corpus)"
+  }
+
+  bucket_options {
+    linear_buckets {
+      num_finite_buckets = 10
+      width              = 1
+      offset             = 0
+    }
+  }
+}
+
+# Ingestion dashboard: backlog, throughput and time to drain the backlog.
+# Charts use PromQL over the log-based metrics above and the Pub/Sub
+# subscription behind the Eventarc trigger.
+locals {
+  subscription_id = basename(var.ingestion_subscription)
+
+  # Each object stays one undelivered message until its import succeeds or
+  # is skipped, so the backlog already accounts for redelivered retries
+  backlog = "sum(pubsub_googleapis_com:subscription_num_undelivered_messages{monitored_resource=\"pubsub_subscription\",subscription_id=\"${local.subscription_id}\"})"
+
+  imported_per_second = "sum(rate(logging_googleapis_com:user_rag_ingestor_ingestion_events{monitored_resource=\"cloud_run_revision\",outcome=\"imported\"}[${var.rate_window}]))"
+
+  dashboard_charts = [
+    {
+      title = "Ingestion backlog (undelivered events)"
+      unit  = "events"
+      query = local.backlog
+    },
+    {
+      title = "Estimated time to drain backlog (minutes)"
+      unit  = "minutes"
+      query = "${local.backlog} / ${local.imported_per_second} / 60"
+    },
+    {
+      title = "Documents imported per minute by corpus"
+      unit  = "docs/min"
+      query = "sum by (corpus) (rate(logging_googleapis_com:user_rag_ingestor_ingestion_events{monitored_resource=\"cloud_run_revision\",outcome=\"imported\"}[${var.rate_window}])) * 60"
+    },
+    {
+      title = "Failed import attempts per minute by corpus"
+      unit  = "attempts/min"
+      query = "sum by (corpus) (rate(logging_googleapis_com:user_rag_ingestor_ingestion_events{monitored_resource=\"cloud_run_revision\",outcome=\"failed\"}[${var.rate_window}])) * 60"
+    },
+    {
+      title = "Bytes imported per minute by corpus"
+      unit  = "bytes/min"
+      query = "sum by (corpus) (rate(logging_googleapis_com:user_rag_ingestor_bytes_processed_sum{monitored_resource=\"cloud_run_revision\"}[${var.rate_window}])) * 60"
+    },
+    {
+      title = "Import duration p95 by corpus (seconds)"
+      unit  = "s"
+      query = "histogram_quantile(0.95, sum by (le, corpus) (rate(logging_googleapis_com:user_rag_ingestor_import_duration_bucket{monitored_resource=\"cloud_run_revision\",outcome=\"imported\"}[${var.rate_window}])))"
+    },
+  ]
+}
+
+resource "google_monitoring_dashboard" "ingestion" {
+  project = var.project_id
+
+  dashboard_json = jsonencode({
+    displayName = "RAG Ingestion"
+    gridLayout = {
+      columns = 2
+      widgets = [
+        for chart in local.dashboard_charts : {
+          title = chart.title
+          xyChart = {
+            dataSets = [{
+              plotType        = "LINE"
+              timeSeriesQuery = { prometheusQuery = chart.query }
+            }]
+            yAxis = {
+              label = chart.unit
+              scale = "LINEAR"
+            }
+          }
+        }
+      ]
+    }
+  })
+}
@@ -0,0 +1,24 @@
+output "ingestion_events_metric" {
+  description = "Log-based metric counting ingestion events by corpus and outcome"
+  value       = "logging.googleapis.com/user/${google_logging_metric.ingestion_events.name}"
+}
+
+output "import_duration_metric" {
+  description = "Log-based metric of import durations by corpus and outcome"
+  value       = "logging.googleapis.com/user/${google_logging_metric.import_duration.name}"
+}
+
+output "bytes_processed_metric" {
+  description = "Log-based metric of imported source bytes by corpus"
+  value       = "logging.googleapis.com/user/${google_logging_metric.bytes_processed.name}"
+}
+
+output "rag_files_imported_metric" {
+  description = "Log-based metric of imported RAG files by corpus"
+  value       = "logging.googleapis.com/user/${google_logging_metric.rag_files_imported.name}"
+}
+
+output "ingestion_dashboard_id" {
+  description = "ID of the ingestion dashboard"
+  value       = google_monitoring_dashboard.ingestion.id
+}
@@ -0,0 +1,15 @@
+variable "project_id" {
+  description = "GCP Project ID"
+  type        = string
+}
+
+variable "ingestion_subscription" {
+  description = "Pub/Sub subscription backing the Eventarc trigger (full resource name)"
+  type        = string
+}
+
+variable "rate_window" {
+  description = "PromQL range used for throughput and ETA rates on the ingestion dashboard"
+  type        = string
+  default     = "10m"
+}
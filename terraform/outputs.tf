@@ -60,6 +60,22 @@ output "eventarc_trigger_name" {
   value       = module.eventarc.trigger_name
 }
 
+output "eventarc_trigger_subscription" {
+  description = "Pub/Sub subscription backing the Eventarc trigger"
+  value       = module.eventarc.trigger_subscription
+}
+
+# Monitoring Outputs
+output "ingestion_events_metric" {
+  description = "Log-based metric counting ingestion events by corpus and outcome"
+  value       = module.monitoring.ingestion_events_metric
+}
+
+output "ingestion_dashboard" {
+  description = "Cloud Monitoring dashboard with the ingestion backlog, throughput and ETA"
+  value       = "https://console.cloud.google.com/monitoring/dashboards/builder/${basename(module.monitoring.ingestion_dashboard_id)}?project=${var.project_id}"
+}
+
 # Quick Start Information
 output "next_steps" {
   description = "Next steps after Terraform deployment"
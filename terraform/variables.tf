@@ -85,6 +85,27 @@ variable "corpora_config" {
   }
 }
 
+# Corpus registry delivered to both services (see corpora.example.json).
+# Leave empty to use the three corpora above.
+variable "corpus_registry" {
+  description = "Corpora registered with rag-ingestor and adk-agent"
+  type = list(object({
+    name        = string
+    corpus_name = string
+    description = optional(string, "")
+    prefixes    = optional(list(string), [])
+    keywords    = optional(list(string), [])
+    default     = optional(bool, false)
+  }))
+  default = []
+
+  validation {
+    # Secret Manager limits a secret version to 64 KiB
+    condition     = length(jsonencode({ corpora = var.corpus_registry })) <= 65536
+    error_message = "The encoded corpus registry must not exceed 64 KiB."
+  }
+}
+
 # Cloud Run Configuration
 variable "rag_ingestor_config" {
   description = "Configuration for rag-ingestor Cloud Run service"